@@ -3,6 +3,7 @@ REST API endpoints for meeting management.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
 from app.models.schemas import (
     JoinMeetingRequest,
     MeetingResponse,
@@ -13,12 +14,18 @@ from app.models.schemas import (
     MeetingPlatform
 )
 from app.services.recall_service import RecallService
-from app.services.openai_service import OpenAIService
+from app.services.openai_service import OpenAIService, MAX_TRANSCRIPT_CHARS
 from app.services.redis_service import RedisService
+from app.services.summary_batch_service import SummaryBatchService
 from app.config import get_settings
+from typing import Dict
+from contextlib import aclosing
 from datetime import datetime
+from secrets import token_hex
+import asyncio
+import hashlib
 import logging
-import uuid
+import time
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/meetings", tags=["meetings"])
@@ -27,14 +34,80 @@ router = APIRouter(prefix="/meetings", tags=["meetings"])
 recall_service: RecallService = None
 openai_service: OpenAIService = None
 redis_service: RedisService = None
+summary_batch_service: SummaryBatchService = None
 
+# Enum values stored in meeting state, resolved once at import
+_STATUS_PENDING = MeetingStatus.PENDING.value
+_STATUS_ENDED = MeetingStatus.ENDED.value
+_PLATFORM_VALUES = {platform: platform.value for platform in MeetingPlatform}
 
-def init_services(recall: RecallService, openai: OpenAIService, redis: RedisService):
+# Transcript tail fed to brief generation; older discussion reaches the
+# model through the running summary kept by the WebSocket handler
+_BRIEF_WINDOW_CHARS = 20000
+
+# Brief generations in progress, keyed by meeting ID and transcript hash
+_inflight_briefs: Dict[str, asyncio.Task] = {}
+
+# Strong references to fire-and-forget tasks so they aren't garbage collected
+_background_tasks = set()
+
+
+def init_services(
+    recall: RecallService,
+    openai: OpenAIService,
+    redis: RedisService,
+    summary_batch: SummaryBatchService
+):
     """Initialize service instances"""
-    global recall_service, openai_service, redis_service
+    global recall_service, openai_service, redis_service, summary_batch_service
     recall_service = recall
     openai_service = openai
     redis_service = redis
+    summary_batch_service = summary_batch
+
+
+def _duration_minutes(state: dict, now_ts: float) -> int:
+    """Minutes elapsed between the meeting start and now_ts"""
+    return int((now_ts - state["started_at_ts"]) / 60)
+
+
+def _briefing_response(
+    meeting_id: str,
+    brief: str,
+    key_points: list,
+    speakers: list,
+    duration_minutes: int,
+    last_updated: datetime
+) -> ORJSONResponse:
+    """
+    Build a BriefingResponse-shaped response directly.
+    
+    The schema stays declared on the route for OpenAPI, but returning the
+    response skips constructing and re-validating the pydantic model.
+    """
+    return ORJSONResponse(content={
+        "meeting_id": meeting_id,
+        "brief": brief,
+        "key_points": key_points,
+        "speakers": speakers,
+        "duration_minutes": duration_minutes,
+        "last_updated": last_updated,
+        "recent_transcript": []
+    })
+
+
+def _on_background_task_done(task: asyncio.Task):
+    """Release a finished background task and log its failure, if any"""
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.error(f"Background task failed: {task.exception()}")
+
+
+def _run_in_background(coro):
+    """Schedule a coroutine whose result the response doesn't depend on"""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_background_task_done)
 
 
 @router.post("/join", response_model=MeetingResponse)
@@ -61,29 +134,24 @@ async def join_meeting(request: JoinMeetingRequest):
             bot_name=request.bot_name
         )
         
-        # Detect platform from URL
-        url_str = str(request.meeting_url).lower()
-        if "zoom.us" in url_str:
-            platform = MeetingPlatform.ZOOM
-        elif "teams.microsoft.com" in url_str or "teams.live.com" in url_str:
-            platform = MeetingPlatform.TEAMS
-        elif "meet.google.com" in url_str:
-            platform = MeetingPlatform.MEET
-        else:
-            platform = MeetingPlatform.UNKNOWN
+        platform = request.platform
+        
+        now_ts = time.time()
+        now = datetime.utcfromtimestamp(now_ts)
+        now_iso = now.isoformat()
         
         # Store meeting state in Redis
         meeting_state = {
             "meeting_id": bot_data["id"],
             "user_id": request.user_id,
             "bot_id": bot_data["id"],
-            "status": MeetingStatus.PENDING.value,
-            "platform": platform.value,
+            "status": _STATUS_PENDING,
+            "platform": _PLATFORM_VALUES[platform],
             "bot_name": request.bot_name,
-            "transcript": "",
             "speakers": [],
-            "started_at": datetime.utcnow().isoformat(),
-            "last_activity": datetime.utcnow().isoformat(),
+            "started_at": now_iso,
+            "started_at_ts": now_ts,
+            "last_activity": now_ts,
             "metadata": {}
         }
         
@@ -95,7 +163,7 @@ async def join_meeting(request: JoinMeetingRequest):
             meeting_id=bot_data["id"],
             status=MeetingStatus.PENDING,
             platform=platform,
-            joined_at=datetime.utcnow(),
+            joined_at=now,
             bot_name=request.bot_name,
             user_id=request.user_id
         )
@@ -105,6 +173,46 @@ async def join_meeting(request: JoinMeetingRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _generate_brief_data(
+    meeting_id: str,
+    transcript: str,
+    summary: str,
+    transcript_hash: str,
+    state: Dict
+) -> Dict:
+    """
+    Generate and cache brief, key points and speakers for a transcript.
+    
+    Args:
+        meeting_id: Unique meeting identifier
+        transcript: Recent meeting transcript text
+        summary: Running summary of the meeting before the transcript window
+        transcript_hash: Hash of the transcript, used as cache key
+        state: Current meeting state
+        
+    Returns:
+        Dict containing brief, key points and speakers
+    """
+    # Generate brief, key points and speakers in one OpenAI call
+    try:
+        brief_data = await openai_service.generate_full_briefing(transcript, summary)
+    except ValueError as e:
+        logger.warning(f"Falling back to separate brief/speaker calls: {e}")
+        brief_data = await openai_service.generate_brief(transcript, summary)
+        brief_data["speakers"] = await openai_service.analyze_speakers(transcript)
+    
+    # Keep previously known speakers if none were detected this time
+    known_speakers = state.get("speakers", [])
+    brief_data["speakers"] = brief_data["speakers"] or known_speakers
+    if brief_data["speakers"] != known_speakers:
+        _run_in_background(
+            redis_service.update_field(meeting_id, "speakers", brief_data["speakers"])
+        )
+    
+    await redis_service.brief_cache_set(meeting_id, transcript_hash, brief_data)
+    return brief_data
+
+
 @router.get("/{meeting_id}/brief", response_model=BriefingResponse)
 async def get_brief(meeting_id: str):
     """
@@ -117,45 +225,55 @@ async def get_brief(meeting_id: str):
         Briefing with summary and key points
     """
     try:
-        # Get meeting state from Redis
-        state = await redis_service.get_meeting_state(meeting_id)
+        now_ts = time.time()
+        now = datetime.utcfromtimestamp(now_ts)
+        
+        # Get meeting state, recent transcript, running summary and last
+        # cached brief in one round trip
+        state, transcript, summary, cached_brief = await redis_service.get_brief_context(
+            meeting_id,
+            last_n_chars=_BRIEF_WINDOW_CHARS
+        )
         
         if not state:
             raise HTTPException(status_code=404, detail="Meeting not found")
         
-        # Get transcript
-        transcript = state.get("transcript", "")
-        
         if not transcript:
-            return BriefingResponse(
-                meeting_id=meeting_id,
+            return _briefing_response(
+                meeting_id,
                 brief="Meeting is starting. No discussion yet.",
                 key_points=[],
                 speakers=[],
                 duration_minutes=0,
-                last_updated=datetime.utcnow()
+                last_updated=now
             )
         
-        # Generate brief using OpenAI
-        brief_data = await openai_service.generate_brief(transcript)
-        
-        # Calculate duration
-        started_at = datetime.fromisoformat(state["started_at"])
-        duration_minutes = int((datetime.utcnow() - started_at).total_seconds() / 60)
+        # Reuse the cached brief while the transcript is unchanged
+        transcript_hash = hashlib.blake2b(transcript.encode(), digest_size=16).hexdigest()
         
-        # Get speakers
-        speakers = state.get("speakers", [])
-        if not speakers:
-            speakers = await openai_service.analyze_speakers(transcript)
-            await redis_service.update_field(meeting_id, "speakers", speakers)
-        
-        return BriefingResponse(
-            meeting_id=meeting_id,
+        if cached_brief and cached_brief.get("transcript_hash") == transcript_hash:
+            brief_data = cached_brief
+        else:
+            # Concurrent pollers of the same transcript share one generation
+            key = f"{meeting_id}:{transcript_hash}"
+            task = _inflight_briefs.get(key)
+            if task is None:
+                task = asyncio.create_task(
+                    _generate_brief_data(meeting_id, transcript, summary, transcript_hash, state)
+                )
+                _inflight_briefs[key] = task
+                task.add_done_callback(lambda _: _inflight_briefs.pop(key, None))
+            
+            # Shield so one caller disconnecting doesn't cancel it for the rest
+            brief_data = await asyncio.shield(task)
+        
+        return _briefing_response(
+            meeting_id,
             brief=brief_data["brief"],
             key_points=brief_data["key_points"],
-            speakers=speakers,
-            duration_minutes=duration_minutes,
-            last_updated=datetime.utcnow()
+            speakers=brief_data["speakers"],
+            duration_minutes=_duration_minutes(state, now_ts),
+            last_updated=now
         )
         
     except HTTPException:
@@ -178,25 +296,29 @@ async def ask_question(meeting_id: str, request: AskQuestionRequest):
         Question response with generated text
     """
     try:
-        # Get meeting state
-        state = await redis_service.get_meeting_state(meeting_id)
+        # Get meeting state and recent transcript for context
+        state, transcript = await redis_service.get_state_and_transcript(
+            meeting_id,
+            last_n_chars=2000
+        )
         
         if not state:
             raise HTTPException(status_code=404, detail="Meeting not found")
         
-        # Get recent transcript for context
-        transcript = await redis_service.get_transcript(meeting_id, last_n_chars=2000)
-        
-        # Generate natural response using OpenAI
-        response_text = await openai_service.generate_response(
-            request.question,
-            transcript
-        )
+        # Stream the response from OpenAI and have the bot speak each
+        # sentence as soon as it is complete
+        sentences = []
+        # aclosing ends the OpenAI stream right away if speaking fails midway
+        async with aclosing(
+            openai_service.stream_response(request.question, transcript)
+        ) as stream:
+            async for sentence in stream:
+                await recall_service.send_speech(state["bot_id"], sentence)
+                sentences.append(sentence)
         
-        # Make bot speak the response
-        await recall_service.send_speech(state["bot_id"], response_text)
+        response_text = " ".join(sentences)
         
-        question_id = f"q_{uuid.uuid4().hex[:8]}"
+        question_id = f"q_{token_hex(4)}"
         
         logger.info(f"Bot {state['bot_id']} answering: {response_text}")
         
@@ -232,17 +354,20 @@ async def get_meeting_status(meeting_id: str):
         if not state:
             raise HTTPException(status_code=404, detail="Meeting not found")
         
-        # Get bot status from Recall.ai
-        bot_data = await recall_service.get_bot(state["bot_id"])
+        # Bot status and transcript length are independent; fetch them together
+        bot_data, transcript_length = await asyncio.gather(
+            recall_service.get_bot(state["bot_id"]),
+            redis_service.get_transcript_length(meeting_id)
+        )
         
-        return {
+        return ORJSONResponse(content={
             "meeting_id": meeting_id,
             "status": state.get("status"),
             "platform": state.get("platform"),
             "bot_status": bot_data.get("status_changes", [])[-1] if bot_data.get("status_changes") else None,
-            "duration_minutes": int((datetime.utcnow() - datetime.fromisoformat(state["started_at"])).total_seconds() / 60),
-            "has_transcript": bool(state.get("transcript"))
-        }
+            "duration_minutes": _duration_minutes(state, time.time()),
+            "has_transcript": transcript_length > 0
+        })
         
     except HTTPException:
         raise
@@ -251,6 +376,32 @@ async def get_meeting_status(meeting_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/{meeting_id}/summary")
+async def get_final_summary(meeting_id: str):
+    """
+    Get the final summary generated after the bot left the meeting.
+    
+    Args:
+        meeting_id: Unique meeting identifier
+        
+    Returns:
+        Final brief, key points and speakers
+    """
+    try:
+        summary = await redis_service.get_final_brief(meeting_id)
+        
+        if not summary:
+            raise HTTPException(status_code=404, detail="Final summary not available")
+        
+        return ORJSONResponse(content={"meeting_id": meeting_id, **summary})
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting final summary: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/{meeting_id}/leave")
 async def leave_meeting(meeting_id: str):
     """
@@ -263,7 +414,12 @@ async def leave_meeting(meeting_id: str):
         Leave status
     """
     try:
-        state = await redis_service.get_meeting_state(meeting_id)
+        # The final summary is built like live briefs: the running summary
+        # plus the most recent transcript, which the prompt caps anyway
+        state, transcript, summary = await redis_service.get_summary_context(
+            meeting_id,
+            last_n_chars=2 * MAX_TRANSCRIPT_CHARS
+        )
         
         if not state:
             raise HTTPException(status_code=404, detail="Meeting not found")
@@ -272,7 +428,11 @@ async def leave_meeting(meeting_id: str):
         await recall_service.leave_meeting(state["bot_id"])
         
         # Update state
-        await redis_service.update_field(meeting_id, "status", MeetingStatus.ENDED.value)
+        await redis_service.update_field(meeting_id, "status", _STATUS_ENDED)
+        
+        # Final summary isn't needed right away; generate it via the Batch API
+        if transcript:
+            summary_batch_service.enqueue(meeting_id, transcript, summary)
         
         logger.info(f"Bot {state['bot_id']} left meeting")
         
@@ -2,7 +2,7 @@
 Application configuration loaded from environment variables.
 """
 
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List
 
@@ -23,6 +23,7 @@ class Settings(BaseSettings):
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_password: str = ""
+    redis_max_connections: int = 32
     
     # Application Configuration
     app_host: str = "0.0.0.0"
@@ -30,19 +31,25 @@ class Settings(BaseSettings):
     app_env: str = "development"
     log_level: str = "INFO"
     
+    # Maximum concurrent OpenAI completion requests per process
+    openai_max_concurrency: int = 16
+    
+    # Seconds between OpenAI Batch API submissions of final summaries
+    summary_batch_interval: int = 300
+    
     # WebSocket Configuration
     websocket_domain: str
     
     # CORS Origins - comma-separated string
     cors_origins: str = "http://localhost:3000"
     
-    # Computed properties
-    @property
+    # Computed properties (cached: settings don't change after load)
+    @cached_property
     def cors_origins_list(self) -> List[str]:
         """Convert comma-separated CORS origins to a list"""
         return [origin.strip() for origin in self.cors_origins.split(",")]
     
-    @property
+    @cached_property
     def redis_url(self) -> str:
         """Build Redis connection URL"""
         if self.redis_password:
@@ -59,16 +66,19 @@ class Settings(BaseSettings):
         env_file=".env",
         env_file_encoding="utf-8",
         case_sensitive=False,
-        extra="ignore"
+        extra="ignore",
+        # The cached instance is shared across the app; keep it read-only
+        frozen=True
     )
 
 
-@lru_cache()
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """
     Get application settings (cached).
     
-    @lru_cache() ensures we only load .env once.
+    @lru_cache ensures we only load .env once. Call get_settings.cache_clear()
+    to reload them, e.g. in tests that change the environment.
     """
     return Settings()
 
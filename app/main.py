@@ -3,8 +3,10 @@ Main FastAPI application for the Meeting Agent system.
 """
 
 from fastapi import FastAPI, WebSocket
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from app.config import get_settings
@@ -14,6 +16,7 @@ from app.services.recall_service import RecallService
 from app.services.deepgram_service import DeepgramService
 from app.services.openai_service import OpenAIService
 from app.services.redis_service import RedisService
+from app.services.summary_batch_service import SummaryBatchService
 
 # Configure logging
 logging.basicConfig(
@@ -27,6 +30,7 @@ recall_service: RecallService = None
 deepgram_service: DeepgramService = None
 openai_service: OpenAIService = None
 redis_service: RedisService = None
+summary_batch_service: SummaryBatchService = None
 
 
 @asynccontextmanager
@@ -39,21 +43,33 @@ async def lifespan(app: FastAPI):
     settings = get_settings()
     
     # Initialize services
-    global recall_service, deepgram_service, openai_service, redis_service
+    global recall_service, deepgram_service, openai_service, redis_service, summary_batch_service
     
     recall_service = RecallService(settings.recall_api_key)
     deepgram_service = DeepgramService(settings.deepgram_api_key)
-    openai_service = OpenAIService(settings.openai_api_key)
-    redis_service = RedisService(settings.redis_url)
+    openai_service = OpenAIService(settings.openai_api_key, settings.openai_max_concurrency)
+    redis_service = RedisService(settings.redis_url, settings.redis_max_connections)
+    summary_batch_service = SummaryBatchService(
+        openai_service,
+        redis_service,
+        flush_interval=settings.summary_batch_interval
+    )
+    
+    # Connect to Redis and warm up API clients in parallel
+    await asyncio.gather(
+        redis_service.connect(),
+        openai_service.warmup(),
+        recall_service.warmup()
+    )
     
-    # Connect to Redis
-    await redis_service.connect()
+    # Start submitting and collecting final summary batches
+    summary_batch_service.start()
     
     # Initialize API routes with services
-    meetings.init_services(recall_service, openai_service, redis_service)
+    meetings.init_services(recall_service, openai_service, redis_service, summary_batch_service)
     
     # Initialize WebSocket handler with services
-    websocket_handler.init_services(deepgram_service, redis_service)
+    websocket_handler.init_services(deepgram_service, redis_service, openai_service)
     
     logger.info("All services initialized successfully")
     
@@ -61,6 +77,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Meeting Agent application...")
+    await summary_batch_service.stop()
+    await openai_service.aclose()
+    await recall_service.aclose()
     await redis_service.disconnect()
     logger.info("Application shutdown complete")
 
@@ -70,6 +89,7 @@ app = FastAPI(
     title="Meeting Agent API",
     description="AI-powered meeting agent that joins meetings, provides briefings, and answers questions",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -135,6 +155,7 @@ async def root():
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
     
     settings = get_settings()
@@ -142,6 +163,10 @@ if __name__ == "__main__":
         "app.main:app",
         host=settings.app_host,
         port=settings.app_port,
+        # C-accelerated event loop and HTTP parser (shipped with uvicorn[standard])
+        loop="uvloop",
+        http="httptools",
+        workers=(os.cpu_count() or 1) if settings.is_production else 1,
         reload=True if settings.app_env == "development" else False,
         log_level=settings.log_level.lower()
     )
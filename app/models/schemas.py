@@ -2,10 +2,12 @@
 Data models and schemas for the meeting agent API.
 """
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, computed_field
+from functools import cached_property
 from typing import Optional, List, Dict
 from datetime import datetime
 from enum import Enum
+import msgspec
 
 
 # ============================================================================
@@ -28,6 +30,15 @@ class MeetingPlatform(str, Enum):
     UNKNOWN = "unknown"
 
 
+# Meeting platform by URL host (subdomains are matched by walking up the labels)
+PLATFORM_BY_HOST = {
+    "zoom.us": MeetingPlatform.ZOOM,
+    "teams.microsoft.com": MeetingPlatform.TEAMS,
+    "teams.live.com": MeetingPlatform.TEAMS,
+    "meet.google.com": MeetingPlatform.MEET,
+}
+
+
 # ============================================================================
 # REQUEST SCHEMAS (Data sent TO the API)
 # ============================================================================
@@ -50,6 +61,18 @@ class JoinMeetingRequest(BaseModel):
         max_length=50
     )
     
+    @computed_field
+    @cached_property
+    def platform(self) -> MeetingPlatform:
+        """Meeting platform detected from the URL host (e.g. us02web.zoom.us)"""
+        host = self.meeting_url.host or ""
+        while host:
+            platform = PLATFORM_BY_HOST.get(host)
+            if platform:
+                return platform
+            host = host.partition(".")[2]
+        return MeetingPlatform.UNKNOWN
+    
     class Config:
         json_schema_extra = {
             "example": {
@@ -151,10 +174,10 @@ class MeetingState(BaseModel):
     bot_id: str
     status: MeetingStatus
     platform: MeetingPlatform
-    transcript: str = ""
     speakers: List[str] = []
     started_at: datetime
-    last_activity: datetime
+    started_at_ts: float  # Epoch seconds
+    last_activity: float  # Epoch seconds
     metadata: Dict = {}
 
 
@@ -168,6 +191,18 @@ class WebSocketMessage(BaseModel):
     data: Dict = Field(description="Message payload")
 
 
+class WebSocketFrame(msgspec.Struct):
+    """
+    Inbound WebSocket control message, decoded with msgspec.
+    
+    Used on the per-message hot path instead of WebSocketMessage, which is
+    kept for documentation.
+    """
+    type: str
+    data: Dict = {}
+    meeting_id: Optional[str] = None
+
+
 if __name__ == "__main__":
     """Test schemas"""
     join_request = JoinMeetingRequest(
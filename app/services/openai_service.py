@@ -2,151 +2,446 @@
 OpenAI integration service for AI processing and response generation.
 """
 
-from openai import AsyncOpenAI
-from typing import List, Dict, Optional
+from openai import AsyncOpenAI, APIConnectionError, RateLimitError
+from cachetools import TTLCache
+from typing import AsyncIterator, Callable, List, Dict, Optional
+import asyncio
+import hashlib
+import httpx
+import json
 import logging
+import random
+import re
 
 logger = logging.getLogger(__name__)
 
+# Whitespace following sentence-ending punctuation
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+# Transcript size limit that keeps prompts well inside the model context window
+MAX_TRANSCRIPT_CHARS = 200000
+
+# Transcripts larger than this are prepared in a worker thread so the
+# event loop keeps serving WebSocket traffic meanwhile
+THREAD_OFFLOAD_CHARS = 16384
+
+# Blank lines and runs of spaces/tabs collapsed before prompting
+BLANK_LINES = re.compile(r"\n\s*\n")
+REPEATED_SPACES = re.compile(r"[ \t]{2,}")
+
+# Completion attempts on rate limiting or connection errors, and the base
+# delay in seconds of the exponential backoff between them
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 0.5
+
+# Recent answers and speaker lists are reused for identical inputs for this
+# many seconds; only the tail of the context is hashed
+RESPONSE_CACHE_TTL = 60
+RESPONSE_CACHE_SIZE = 1024
+RESPONSE_CONTEXT_CHARS = 4096
+SPEAKERS_CONTEXT_CHARS = 8192
+
+# JSON schema for the combined briefing response
+BRIEFING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "brief": {"type": "string"},
+        "key_points": {"type": "array", "items": {"type": "string"}},
+        "speakers": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["brief", "key_points", "speakers"],
+    "additionalProperties": False
+}
+
+# Instructions shared by the JSON-mode and structured briefing prompts
+BRIEFING_INSTRUCTIONS = """You are a meeting assistant. Generate concise briefings from meeting transcripts.
+
+Your briefing should include:
+1. Main topics being discussed
+2. Key decisions made
+3. Action items mentioned
+4. Current discussion focus
+
+Keep it concise and informative."""
+
+# System messages, built once and shared by every request
+SYSTEM_BRIEF_MSG = {
+    "role": "system",
+    "content": BRIEFING_INSTRUCTIONS + """
+
+Return JSON with fields "brief" (string) and "key_points" (array of 3-5 strings)."""
+}
+
+SYSTEM_FULL_BRIEFING_MSG = {
+    "role": "system",
+    "content": BRIEFING_INSTRUCTIONS + """ Also extract 3-5 key bullet points from the
+briefing and the unique speaker names/identifiers from the transcript."""
+}
+
+SYSTEM_SUMMARY_MSG = {
+    "role": "system",
+    "content": """You maintain a running summary of a live meeting.
+
+Merge the new transcript segments into the existing summary. Keep topics,
+decisions, action items and who said what. Stay under 300 words."""
+}
+
+SYSTEM_RESPONSE_MSG = {
+    "role": "system",
+    "content": """You are an AI assistant in a live meeting. Answer questions based on the meeting discussion.
+
+Guidelines:
+- Be concise and natural
+- Base answers on the meeting context provided
+- If information isn't in the context, say so politely
+- Keep responses suitable for speaking aloud in a meeting
+- Aim for 2-3 sentences"""
+}
+
+SYSTEM_SPEAKERS_MSG = {
+    "role": "system",
+    "content": "Extract unique speaker names/identifiers from this transcript. Return as a comma-separated list."
+}
+
+
+def prepare_transcript(transcript: str) -> str:
+    """Collapse redundant whitespace and keep the most recent part of a transcript"""
+    # Trim first so the regex passes never scan more than twice the budget
+    transcript = transcript[-2 * MAX_TRANSCRIPT_CHARS:]
+    transcript = BLANK_LINES.sub("\n", transcript)
+    transcript = REPEATED_SPACES.sub(" ", transcript)
+    return transcript[-MAX_TRANSCRIPT_CHARS:].strip()
+
+
+def briefing_prompt(transcript: str, summary: Optional[str] = None) -> str:
+    """Build the user prompt for a briefing from the recent transcript and running summary"""
+    if summary:
+        return (
+            f"Summary of the meeting so far:\n{summary}\n\n"
+            f"Recent transcript:\n{transcript}\n\nGenerate a brief meeting summary."
+        )
+    return f"Transcript:\n{transcript}\n\nGenerate a brief meeting summary."
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait before retrying: the server's Retry-After if given, else jittered backoff"""
+    if isinstance(error, RateLimitError):
+        try:
+            return max(float(error.response.headers.get("retry-after")), 0.0)
+        except (TypeError, ValueError):
+            pass
+    return BACKOFF_BASE * 2 ** attempt + random.random() * 0.1
+
+
+def cache_key(*parts: str) -> bytes:
+    """Hash prompt inputs into a compact cache key"""
+    return hashlib.blake2b("\0".join(parts).encode(), digest_size=16).digest()
+
+
+async def run_cpu_bound(size: int, func: Callable, *args):
+    """Run func in a worker thread if its input is large enough to stall the event loop"""
+    if size > THREAD_OFFLOAD_CHARS:
+        return await asyncio.to_thread(func, *args)
+    return func(*args)
+
 
 class OpenAIService:
     """Service for AI processing using OpenAI API"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, max_concurrency: int = 16):
         """
         Initialize OpenAI service.
         
         Args:
             api_key: OpenAI API key
+            max_concurrency: Maximum completion requests in flight at once
         """
-        self.client = AsyncOpenAI(api_key=api_key)
+        # Sized above the semaphore so concurrent completions, streams and
+        # batch uploads all reuse warm HTTP/2 connections
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=256,
+                    max_keepalive_connections=64,
+                    keepalive_expiry=60.0
+                ),
+                timeout=httpx.Timeout(30.0, connect=5.0)
+            )
+        )
         self.model = "gpt-4o-mini"
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        
+        # Completions are retried by _create_completion, not by the client
+        self._completions_client = self.client.with_options(max_retries=0)
+        
+        # Answers and speaker lists for recently seen inputs
+        self._cache = TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL)
+    
+    async def aclose(self):
+        """Close pooled connections"""
+        await self.client.close()
+    
+    async def warmup(self):
+        """Check credentials and open a connection to OpenAI ahead of the first request"""
+        try:
+            await self.client.models.retrieve(self.model)
+            logger.info("OpenAI client warmed up")
+        except Exception as e:
+            logger.warning(f"OpenAI warmup failed: {e}")
+    
+    async def _create_completion(self, **kwargs):
+        """
+        Create a chat completion, throttled and retried with backoff.
+        
+        The semaphore keeps bursts from many meetings under the account's
+        rate limits instead of letting them fail and retry.
+        """
+        async with self._semaphore:
+            for attempt in range(MAX_ATTEMPTS):
+                try:
+                    return await self._completions_client.chat.completions.create(**kwargs)
+                except (RateLimitError, APIConnectionError) as e:
+                    # An exhausted quota is also a 429, but waiting won't help
+                    if attempt == MAX_ATTEMPTS - 1 or e.code == "insufficient_quota":
+                        raise
+                    delay = _retry_delay(e, attempt)
+                    logger.warning(f"OpenAI request failed ({e}), retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
     
     async def generate_brief(
         self, 
         transcript: str,
-        previous_brief: Optional[str] = None
+        summary: Optional[str] = None
     ) -> Dict[str, any]:
         """
         Generate meeting briefing from transcript.
         
         Args:
             transcript: Meeting transcript text
-            previous_brief: Previous briefing for context
+            summary: Running summary of the meeting before the transcript window
             
         Returns:
             Dict containing brief and key points
         """
         try:
-            system_prompt = """You are a meeting assistant. Generate concise briefings from meeting transcripts.
+            transcript = await run_cpu_bound(len(transcript), prepare_transcript, transcript)
             
-Your briefing should include:
-1. Main topics being discussed
-2. Key decisions made
-3. Action items mentioned
-4. Current discussion focus
-
-Keep it concise and informative."""
-            
-            user_prompt = f"Transcript:\n{transcript}\n\nGenerate a brief meeting summary."
-            
-            if previous_brief:
-                user_prompt = f"Previous brief:\n{previous_brief}\n\n{user_prompt}\n\nUpdate the brief with new information."
-            
-            response = await self.client.chat.completions.create(
+            response = await self._create_completion(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
+                    SYSTEM_BRIEF_MSG,
+                    {"role": "user", "content": briefing_prompt(transcript, summary)}
                 ],
+                response_format={"type": "json_object"},
                 temperature=0.7,
-                max_tokens=500
+                max_tokens=700
             )
             
-            brief_text = response.choices[0].message.content
+            content = response.choices[0].message.content
             
-            # Extract key points
-            key_points = await self._extract_key_points(brief_text)
+            try:
+                data = json.loads(content)
+                return {
+                    "brief": str(data["brief"]),
+                    "key_points": [str(p) for p in data["key_points"]][:5]
+                }
+            except (TypeError, KeyError, json.JSONDecodeError):
+                logger.warning("Brief response was not valid JSON, returning it as plain text")
+                return {
+                    "brief": content,
+                    "key_points": []
+                }
             
+        except Exception as e:
+            logger.error(f"Error generating brief: {e}")
+            raise
+    
+    def full_briefing_request(
+        self,
+        transcript: str,
+        summary: Optional[str] = None
+    ) -> Dict[str, any]:
+        """
+        Build the chat completion request for a combined briefing.
+        
+        Shared by the live API call and the Batch API submissions.
+        
+        Args:
+            transcript: Meeting transcript text
+            summary: Running summary of the meeting before the transcript window
+            
+        Returns:
+            Chat completion request parameters
+        """
+        transcript = prepare_transcript(transcript)
+        
+        return {
+            "model": self.model,
+            "messages": [
+                SYSTEM_FULL_BRIEFING_MSG,
+                {"role": "user", "content": briefing_prompt(transcript, summary)}
+            ],
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "meeting_briefing",
+                    "strict": True,
+                    "schema": BRIEFING_SCHEMA
+                }
+            },
+            "temperature": 0.7,
+            "max_tokens": 700
+        }
+    
+    def parse_full_briefing(self, content: str) -> Dict[str, any]:
+        """
+        Parse a combined briefing response.
+        
+        Args:
+            content: Message content returned by the model
+            
+        Returns:
+            Dict containing brief, key points and speakers
+            
+        Raises:
+            ValueError: If the content does not match the briefing schema
+        """
+        try:
+            data = json.loads(content)
             return {
-                "brief": brief_text,
-                "key_points": key_points
+                "brief": str(data["brief"]),
+                "key_points": [str(p) for p in data["key_points"]][:5],
+                "speakers": [str(s) for s in data["speakers"] if str(s).strip()]
             }
+        except (TypeError, KeyError, json.JSONDecodeError) as e:
+            raise ValueError(f"Invalid briefing response: {e}") from e
+    
+    async def generate_full_briefing(
+        self,
+        transcript: str,
+        summary: Optional[str] = None
+    ) -> Dict[str, any]:
+        """
+        Generate briefing, key points and speakers in a single request.
+        
+        Args:
+            transcript: Meeting transcript text
+            summary: Running summary of the meeting before the transcript window
+            
+        Returns:
+            Dict containing brief, key points and speakers
             
+        Raises:
+            ValueError: If the response does not match the briefing schema
+        """
+        try:
+            request = await run_cpu_bound(len(transcript), self.full_briefing_request, transcript, summary)
+            response = await self._create_completion(**request)
         except Exception as e:
-            logger.error(f"Error generating brief: {e}")
+            logger.error(f"Error generating full briefing: {e}")
             raise
+        
+        return self.parse_full_briefing(response.choices[0].message.content)
     
-    async def _extract_key_points(self, brief: str) -> List[str]:
-        """Extract key points from brief"""
+    async def update_summary(self, summary: str, segments: str) -> str:
+        """
+        Fold new transcript segments into the running meeting summary.
+        
+        Args:
+            summary: Current running summary, empty at the start of the meeting
+            segments: Transcript text spoken since the last update
+            
+        Returns:
+            Updated summary text
+        """
         try:
-            response = await self.client.chat.completions.create(
+            user_prompt = f"Existing summary:\n{summary or '(none yet)'}\n\nNew transcript segments:\n{segments}"
+            
+            response = await self._create_completion(
                 model=self.model,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": "Extract 3-5 key bullet points from this meeting brief. Return only the bullet points, one per line."
-                    },
-                    {"role": "user", "content": brief}
+                    SYSTEM_SUMMARY_MSG,
+                    {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.3,
-                max_tokens=200
+                max_tokens=500
             )
             
-            points_text = response.choices[0].message.content
-            points = [p.strip("- •") for p in points_text.split("\n") if p.strip()]
-            return points[:5]
+            return response.choices[0].message.content.strip()
             
         except Exception as e:
-            logger.error(f"Error extracting key points: {e}")
-            return []
+            logger.error(f"Error updating summary: {e}")
+            raise
     
-    async def generate_response(
-        self, 
-        question: str, 
+    def _response_messages(self, question: str, context: str) -> List[Dict[str, str]]:
+        """Build chat messages for answering a question in the meeting"""
+        user_prompt = f"""Meeting context:
+{context}
+
+Question: {question}
+
+Provide a natural, concise response suitable for speaking in the meeting."""
+        
+        return [
+            SYSTEM_RESPONSE_MSG,
+            {"role": "user", "content": user_prompt}
+        ]
+    
+    async def stream_response(
+        self,
+        question: str,
         context: str
-    ) -> str:
+    ) -> AsyncIterator[str]:
         """
-        Generate response to user question based on meeting context.
+        Stream response to user question one sentence at a time.
         
         Args:
             question: User's question
             context: Meeting transcript/context
             
-        Returns:
-            AI-generated response text
+        Yields:
+            Complete sentences of the response as soon as they are generated
         """
+        key = cache_key("response", question, context[-RESPONSE_CONTEXT_CHARS:])
+        cached = self._cache.get(key)
+        if cached is not None:
+            for sentence in cached:
+                yield sentence
+            return
+        
         try:
-            system_prompt = """You are an AI assistant in a live meeting. Answer questions based on the meeting discussion.
-            
-Guidelines:
-- Be concise and natural
-- Base answers on the meeting context provided
-- If information isn't in the context, say so politely
-- Keep responses suitable for speaking aloud in a meeting
-- Aim for 2-3 sentences"""
-            
-            user_prompt = f"""Meeting context:
-{context}
-
-Question: {question}
-
-Provide a natural, concise response suitable for speaking in the meeting."""
-            
-            response = await self.client.chat.completions.create(
+            stream = await self._create_completion(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
+                messages=self._response_messages(question, context),
                 temperature=0.7,
-                max_tokens=150
+                max_tokens=150,
+                stream=True
             )
             
-            return response.choices[0].message.content
+            buffer = ""
+            answer = []
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                buffer += chunk.choices[0].delta.content
+                
+                # Everything before the last boundary is a finished sentence
+                *sentences, buffer = SENTENCE_BOUNDARY.split(buffer)
+                for sentence in sentences:
+                    if sentence.strip():
+                        answer.append(sentence.strip())
+                        yield sentence.strip()
             
+            if buffer.strip():
+                answer.append(buffer.strip())
+                yield buffer.strip()
+            
+            self._cache[key] = answer
+                
         except Exception as e:
-            logger.error(f"Error generating response: {e}")
+            logger.error(f"Error streaming response: {e}")
             raise
     
     async def analyze_speakers(self, transcript: str) -> List[str]:
@@ -159,14 +454,18 @@ Provide a natural, concise response suitable for speaking in the meeting."""
         Returns:
             List of speaker names/identifiers
         """
+        # The speaker set rarely changes between consecutive transcript updates
+        key = cache_key("speakers", transcript[-SPEAKERS_CONTEXT_CHARS:])
+        cached = self._cache.get(key)
+        if cached is not None:
+            return list(cached)
+        
         try:
-            response = await self.client.chat.completions.create(
+            transcript = await run_cpu_bound(len(transcript), prepare_transcript, transcript)
+            response = await self._create_completion(
                 model=self.model,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": "Extract unique speaker names/identifiers from this transcript. Return as a comma-separated list."
-                    },
+                    SYSTEM_SPEAKERS_MSG,
                     {"role": "user", "content": transcript}
                 ],
                 temperature=0.3,
@@ -175,7 +474,8 @@ Provide a natural, concise response suitable for speaking in the meeting."""
             
             speakers_text = response.choices[0].message.content
             speakers = [s.strip() for s in speakers_text.split(",") if s.strip()]
-            return speakers
+            self._cache[key] = speakers
+            return list(speakers)
             
         except Exception as e:
             logger.error(f"Error analyzing speakers: {e}")
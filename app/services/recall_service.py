@@ -4,10 +4,19 @@ Recall.ai integration service for managing meeting bots.
 
 import httpx
 from typing import Dict, Optional
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Request attempts on transient failures, and the base delay in seconds of
+# the exponential backoff between them
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 0.5
+
+# Responses worth retrying; the server may not have handled the request
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
 
 class RecallService:
     """Service for interacting with Recall.ai API"""
@@ -25,6 +34,77 @@ class RecallService:
             "Authorization": f"Token {self.api_key}",
             "Content-Type": "application/json"
         }
+        
+        # One long-lived client so requests reuse pooled keep-alive
+        # connections instead of a new TCP/TLS handshake per call; HTTP/2
+        # lets concurrent bot requests share a single connection
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=30.0
+            ),
+            http2=True
+        )
+    
+    async def aclose(self):
+        """Close pooled connections"""
+        await self.client.aclose()
+    
+    async def warmup(self):
+        """Check credentials and open a connection to Recall.ai ahead of the first request"""
+        try:
+            response = await self.client.get(
+                "/bot/",
+                params={"page_size": 1},
+                timeout=10.0
+            )
+            response.raise_for_status()
+            logger.info("Recall.ai client warmed up")
+        except httpx.HTTPError as e:
+            logger.warning(f"Recall.ai warmup failed: {e}")
+    
+    async def _request(self, method: str, path: str, **kwargs) -> Dict:
+        """
+        Send a request on the shared client, retrying transient failures.
+        
+        GET requests are retried on any retryable status or transport error.
+        Other methods aren't idempotent (a retried create or speak could run
+        twice), so they are only retried when the request provably wasn't
+        processed: on 429 or when the connection couldn't be established.
+        
+        Returns:
+            Decoded JSON response body
+        """
+        idempotent = method == "GET"
+        
+        for attempt in range(MAX_ATTEMPTS):
+            last_attempt = attempt == MAX_ATTEMPTS - 1
+            try:
+                response = await self.client.request(method, path, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                if last_attempt:
+                    raise
+                error = e
+            except httpx.TransportError as e:
+                if last_attempt or not idempotent:
+                    raise
+                error = e
+            else:
+                retryable = response.status_code == 429 or (
+                    idempotent and response.status_code in RETRY_STATUS_CODES
+                )
+                if not retryable or last_attempt:
+                    response.raise_for_status()
+                    return response.json()
+                error = f"HTTP {response.status_code}"
+            
+            delay = BACKOFF_BASE * 2 ** attempt
+            logger.warning(f"Recall.ai {method} {path} failed ({error}), retrying in {delay}s")
+            await asyncio.sleep(delay)
     
     async def create_bot(
         self, 
@@ -43,30 +123,26 @@ class RecallService:
         Returns:
             Dict containing bot information including bot_id
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/bot/",
-                    headers=self.headers,
-                    json={
-                        "meeting_url": meeting_url,
-                        "bot_name": bot_name,
-                        "transcription_options": {
-                            "provider": "deepgram"
-                        },
-                        "real_time_transcription": {
-                            "destination_url": websocket_url
-                        }
+        try:
+            bot_data = await self._request(
+                "POST",
+                "/bot/",
+                json={
+                    "meeting_url": meeting_url,
+                    "bot_name": bot_name,
+                    "transcription_options": {
+                        "provider": "deepgram"
                     },
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                bot_data = response.json()
-                logger.info(f"Created bot {bot_data.get('id')} for meeting {meeting_url}")
-                return bot_data
-            except httpx.HTTPError as e:
-                logger.error(f"Failed to create bot: {e}")
-                raise
+                    "real_time_transcription": {
+                        "destination_url": websocket_url
+                    }
+                }
+            )
+            logger.info(f"Created bot {bot_data.get('id')} for meeting {meeting_url}")
+            return bot_data
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to create bot: {e}")
+            raise
     
     async def get_bot(self, bot_id: str) -> Dict:
         """
@@ -78,18 +154,11 @@ class RecallService:
         Returns:
             Dict containing bot information
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/bot/{bot_id}/",
-                    headers=self.headers,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPError as e:
-                logger.error(f"Failed to get bot {bot_id}: {e}")
-                raise
+        try:
+            return await self._request("GET", f"/bot/{bot_id}/")
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to get bot {bot_id}: {e}")
+            raise
     
     async def send_speech(self, bot_id: str, text: str) -> Dict:
         """
@@ -102,20 +171,13 @@ class RecallService:
         Returns:
             Dict containing speech request status
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/bot/{bot_id}/speak/",
-                    headers=self.headers,
-                    json={"text": text},
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                logger.info(f"Bot {bot_id} speaking: {text[:50]}...")
-                return response.json()
-            except httpx.HTTPError as e:
-                logger.error(f"Failed to make bot {bot_id} speak: {e}")
-                raise
+        try:
+            result = await self._request("POST", f"/bot/{bot_id}/speak/", json={"text": text})
+            logger.info(f"Bot {bot_id} speaking: {text[:50]}...")
+            return result
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to make bot {bot_id} speak: {e}")
+            raise
     
     async def leave_meeting(self, bot_id: str) -> Dict:
         """
@@ -127,16 +189,10 @@ class RecallService:
         Returns:
             Dict containing leave request status
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/bot/{bot_id}/leave/",
-                    headers=self.headers,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                logger.info(f"Bot {bot_id} left meeting")
-                return response.json()
-            except httpx.HTTPError as e:
-                logger.error(f"Failed to make bot {bot_id} leave: {e}")
-                raise
+        try:
+            result = await self._request("POST", f"/bot/{bot_id}/leave/")
+            logger.info(f"Bot {bot_id} left meeting")
+            return result
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to make bot {bot_id} leave: {e}")
+            raise
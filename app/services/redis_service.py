@@ -3,35 +3,93 @@ Redis service for state management and caching.
 """
 
 import redis.asyncio as redis
-import json
-from typing import Optional, Dict, Any
+import orjson
+from typing import Optional, Dict, Any, List, Set, Tuple
 import logging
-from datetime import datetime
+import time
 
 logger = logging.getLogger(__name__)
 
+# Sets fields of an existing meeting state hash and refreshes its expiry,
+# without creating state for unknown meetings. ARGV holds field/value pairs.
+UPDATE_FIELDS_SCRIPT = """
+if redis.call("EXISTS", KEYS[1]) == 0 then
+    return 0
+end
+redis.call("HSET", KEYS[1], unpack(ARGV))
+redis.call("EXPIRE", KEYS[1], 86400)
+return 1
+"""
+
+
+def _decode_text(data: Optional[bytes]) -> str:
+    """
+    Decode a stored text value, stripping surrounding whitespace.
+    
+    Transcript tails are read by byte offset and may start mid-character;
+    the partial bytes are dropped instead of failing.
+    """
+    return data.decode("utf-8", errors="ignore").strip() if data else ""
+
+
+def _read_transcript(client, meeting_id: str, last_n_chars: Optional[int] = None):
+    """
+    Read a transcript, or its last N bytes, on a client or pipeline.
+    
+    On a client this returns the awaitable reply; on a pipeline it queues
+    the command.
+    """
+    key = f"meeting:{meeting_id}:transcript"
+    if last_n_chars:
+        # Negative offsets address the tail directly, no STRLEN needed
+        return client.getrange(key, -last_n_chars, -1)
+    return client.get(key)
+
+
+def _encode_field(value: Any) -> bytes:
+    """Encode one meeting state field for storage in the state hash"""
+    return orjson.dumps(value, option=orjson.OPT_NAIVE_UTC)
+
+
+def _decode_state(data: Dict[bytes, bytes]) -> Optional[Dict[str, Any]]:
+    """Decode a meeting state hash, or None if the meeting doesn't exist"""
+    if not data:
+        return None
+    return {field.decode(): orjson.loads(value) for field, value in data.items()}
+
 
 class RedisService:
     """Service for managing state in Redis"""
     
-    def __init__(self, redis_url: str):
+    def __init__(self, redis_url: str, max_connections: int = 32):
         """
         Initialize Redis service.
         
         Args:
             redis_url: Redis connection URL
+            max_connections: Connection pool size shared by concurrent requests
         """
         self.redis_url = redis_url
+        self.max_connections = max_connections
+        self.pool: Optional[redis.BlockingConnectionPool] = None
         self.client: Optional[redis.Redis] = None
+        self._update_fields = None
     
     async def connect(self):
-        """Establish connection to Redis"""
+        """Establish connection pool to Redis"""
         try:
-            self.client = await redis.from_url(
+            # Blocking pool: requests wait for a free connection instead of
+            # failing once all of them are in use
+            self.pool = redis.BlockingConnectionPool.from_url(
                 self.redis_url,
-                encoding="utf-8",
-                decode_responses=True
+                max_connections=self.max_connections,
+                timeout=5,
+                # Raw bytes go straight into orjson; text values are decoded
+                # where they are read
+                decode_responses=False
             )
+            self.client = redis.Redis(connection_pool=self.pool)
+            self._update_fields = self.client.register_script(UPDATE_FIELDS_SCRIPT)
             await self.client.ping()
             logger.info("Connected to Redis")
         except Exception as e:
@@ -42,21 +100,29 @@ class RedisService:
         """Close Redis connection"""
         if self.client:
             await self.client.close()
+        if self.pool:
+            await self.pool.disconnect()
             logger.info("Disconnected from Redis")
     
     async def save_meeting_state(self, meeting_id: str, state: Dict[str, Any]):
         """
-        Save meeting state to Redis.
+        Save meeting state to Redis, replacing any existing state.
+        
+        State is a hash with one JSON-encoded value per field, so single
+        fields can be updated without rewriting the rest.
         
         Args:
             meeting_id: Unique meeting identifier
             state: Meeting state data
         """
         try:
-            key = f"meeting:{meeting_id}"
-            state["last_activity"] = datetime.utcnow().isoformat()
-            await self.client.set(key, json.dumps(state))
-            await self.client.expire(key, 86400)  # Expire after 24 hours
+            key = f"meeting:{meeting_id}:state"
+            state["last_activity"] = time.time()
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                pipe.hset(key, mapping={field: _encode_field(value) for field, value in state.items()})
+                pipe.expire(key, 86400)  # Expire after 24 hours
+                await pipe.execute()
             logger.debug(f"Saved state for meeting {meeting_id}")
         except Exception as e:
             logger.error(f"Error saving meeting state: {e}")
@@ -73,15 +139,224 @@ class RedisService:
             Meeting state dict or None if not found
         """
         try:
-            key = f"meeting:{meeting_id}"
-            data = await self.client.get(key)
-            if data:
-                return json.loads(data)
-            return None
+            return _decode_state(await self.client.hgetall(f"meeting:{meeting_id}:state"))
         except Exception as e:
             logger.error(f"Error getting meeting state: {e}")
             raise
     
+    async def get_brief_context(
+        self,
+        meeting_id: str,
+        last_n_chars: Optional[int] = None
+    ) -> Tuple[Optional[Dict[str, Any]], str, str, Optional[Dict[str, Any]]]:
+        """
+        Retrieve everything needed for a briefing in a single round trip.
+        
+        Args:
+            meeting_id: Unique meeting identifier
+            last_n_chars: Optional limit to last N characters (bytes) of transcript
+            
+        Returns:
+            Tuple of (meeting state or None, transcript text, running summary,
+            cached briefing or None)
+        """
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.hgetall(f"meeting:{meeting_id}:state")
+                _read_transcript(pipe, meeting_id, last_n_chars)
+                pipe.get(f"meeting:{meeting_id}:summary")
+                pipe.get(f"brief:{meeting_id}")
+                state_data, transcript, summary, brief_data = await pipe.execute()
+            state = _decode_state(state_data)
+            cached_brief = orjson.loads(brief_data) if brief_data else None
+            return state, _decode_text(transcript), _decode_text(summary), cached_brief
+        except Exception as e:
+            logger.error(f"Error getting brief context: {e}")
+            raise
+    
+    async def get_summary_context(
+        self,
+        meeting_id: str,
+        last_n_chars: Optional[int] = None
+    ) -> Tuple[Optional[Dict[str, Any]], str, str]:
+        """
+        Retrieve meeting state, transcript and running summary in a single round trip.
+        
+        Args:
+            meeting_id: Unique meeting identifier
+            last_n_chars: Optional limit to last N characters (bytes) of transcript
+            
+        Returns:
+            Tuple of (meeting state or None, transcript text, running summary)
+        """
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.hgetall(f"meeting:{meeting_id}:state")
+                _read_transcript(pipe, meeting_id, last_n_chars)
+                pipe.get(f"meeting:{meeting_id}:summary")
+                state_data, transcript, summary = await pipe.execute()
+            return _decode_state(state_data), _decode_text(transcript), _decode_text(summary)
+        except Exception as e:
+            logger.error(f"Error getting summary context: {e}")
+            raise
+    
+    async def brief_cache_set(
+        self,
+        meeting_id: str,
+        transcript_hash: str,
+        payload: Dict[str, Any],
+        ttl: int = 300
+    ):
+        """
+        Cache a generated briefing for the given transcript.
+        
+        Only the latest briefing is kept per meeting; the transcript hash is
+        stored alongside it so stale entries are never served.
+        
+        Args:
+            meeting_id: Unique meeting identifier
+            transcript_hash: Hash of the transcript the briefing was built from
+            payload: Briefing data (brief, key_points, speakers)
+            ttl: Cache lifetime in seconds
+        """
+        try:
+            data = orjson.dumps({**payload, "transcript_hash": transcript_hash})
+            await self.client.setex(f"brief:{meeting_id}", ttl, data)
+        except Exception as e:
+            logger.error(f"Error caching brief: {e}")
+            raise
+    
+    async def get_summary(self, meeting_id: str) -> str:
+        """
+        Get the running summary of the meeting so far.
+        
+        Args:
+            meeting_id: Unique meeting identifier
+            
+        Returns:
+            Summary text, empty if none has been written yet
+        """
+        try:
+            return _decode_text(await self.client.get(f"meeting:{meeting_id}:summary"))
+        except Exception as e:
+            logger.error(f"Error getting summary: {e}")
+            raise
+    
+    async def set_summary(self, meeting_id: str, summary: str):
+        """
+        Replace the running summary of the meeting.
+        
+        Args:
+            meeting_id: Unique meeting identifier
+            summary: Updated summary text
+        """
+        try:
+            await self.client.set(
+                f"meeting:{meeting_id}:summary",
+                summary,
+                ex=86400  # Expire after 24 hours
+            )
+        except Exception as e:
+            logger.error(f"Error saving summary: {e}")
+            raise
+    
+    async def set_final_brief(self, meeting_id: str, summary: Dict[str, Any]):
+        """
+        Store the final post-meeting summary.
+        
+        Args:
+            meeting_id: Unique meeting identifier
+            summary: Summary data (brief, key_points, speakers)
+        """
+        try:
+            await self.client.set(
+                f"meeting:{meeting_id}:final_brief",
+                orjson.dumps(summary),
+                ex=86400  # Expire after 24 hours
+            )
+        except Exception as e:
+            logger.error(f"Error saving final brief: {e}")
+            raise
+    
+    async def get_final_brief(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve the final post-meeting summary.
+        
+        Args:
+            meeting_id: Unique meeting identifier
+            
+        Returns:
+            Summary data or None if it isn't available (yet)
+        """
+        try:
+            data = await self.client.get(f"meeting:{meeting_id}:final_brief")
+            return orjson.loads(data) if data else None
+        except Exception as e:
+            logger.error(f"Error getting final brief: {e}")
+            raise
+    
+    async def add_summary_batch(self, batch_id: str):
+        """
+        Track a submitted summary batch until its results are collected.
+        
+        Args:
+            batch_id: OpenAI batch identifier
+        """
+        try:
+            await self.client.sadd("summary_batches", batch_id)
+        except Exception as e:
+            logger.error(f"Error tracking summary batch: {e}")
+            raise
+    
+    async def get_summary_batches(self) -> Set[str]:
+        """
+        Get summary batches whose results haven't been collected yet.
+        
+        Returns:
+            Set of OpenAI batch identifiers
+        """
+        try:
+            batch_ids = await self.client.smembers("summary_batches")
+            return {batch_id.decode() for batch_id in batch_ids}
+        except Exception as e:
+            logger.error(f"Error getting summary batches: {e}")
+            raise
+    
+    async def claim_summary_batch(self, batch_id: str, ttl: int) -> bool:
+        """
+        Claim a summary batch for one collection pass across all workers.
+        
+        Args:
+            batch_id: OpenAI batch identifier
+            ttl: Seconds before other workers may claim the batch again
+            
+        Returns:
+            True if this caller holds the claim
+        """
+        try:
+            return bool(await self.client.set(
+                f"summary_batch:{batch_id}:lock",
+                b"1",
+                nx=True,
+                ex=ttl
+            ))
+        except Exception as e:
+            logger.error(f"Error claiming summary batch: {e}")
+            raise
+    
+    async def remove_summary_batch(self, batch_id: str):
+        """
+        Stop tracking a summary batch.
+        
+        Args:
+            batch_id: OpenAI batch identifier
+        """
+        try:
+            await self.client.srem("summary_batches", batch_id)
+        except Exception as e:
+            logger.error(f"Error removing summary batch: {e}")
+            raise
+    
     async def delete_meeting_state(self, meeting_id: str):
         """
         Delete meeting state from Redis.
@@ -90,8 +365,13 @@ class RedisService:
             meeting_id: Unique meeting identifier
         """
         try:
-            key = f"meeting:{meeting_id}"
-            await self.client.delete(key)
+            await self.client.delete(
+                f"meeting:{meeting_id}:state",
+                f"meeting:{meeting_id}:transcript",
+                f"meeting:{meeting_id}:summary",
+                f"meeting:{meeting_id}:final_brief",
+                f"brief:{meeting_id}"
+            )
             logger.debug(f"Deleted state for meeting {meeting_id}")
         except Exception as e:
             logger.error(f"Error deleting meeting state: {e}")
@@ -105,12 +385,25 @@ class RedisService:
             meeting_id: Unique meeting identifier
             text: Text to append
         """
+        await self.append_transcript_batch(meeting_id, [text])
+    
+    async def append_transcript_batch(self, meeting_id: str, texts: List[str]):
+        """
+        Append several transcript segments with a single command.
+        
+        The transcript lives in its own key so appends don't rewrite
+        the meeting state.
+        
+        Args:
+            meeting_id: Unique meeting identifier
+            texts: Text segments to append, in order
+        """
         try:
-            state = await self.get_meeting_state(meeting_id)
-            if state:
-                current_transcript = state.get("transcript", "")
-                state["transcript"] = f"{current_transcript}\n{text}".strip()
-                await self.save_meeting_state(meeting_id, state)
+            key = f"meeting:{meeting_id}:transcript"
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.append(key, "".join(f"\n{text}" for text in texts))
+                pipe.expire(key, 86400)  # Expire after 24 hours
+                await pipe.execute()
         except Exception as e:
             logger.error(f"Error appending transcript: {e}")
             raise
@@ -121,37 +414,78 @@ class RedisService:
         
         Args:
             meeting_id: Unique meeting identifier
-            last_n_chars: Optional limit to last N characters
+            last_n_chars: Optional limit to last N characters (bytes)
             
         Returns:
             Transcript text
         """
         try:
-            state = await self.get_meeting_state(meeting_id)
-            if state:
-                transcript = state.get("transcript", "")
-                if last_n_chars and len(transcript) > last_n_chars:
-                    return transcript[-last_n_chars:]
-                return transcript
-            return ""
+            transcript = await _read_transcript(self.client, meeting_id, last_n_chars)
+            return _decode_text(transcript)
         except Exception as e:
             logger.error(f"Error getting transcript: {e}")
             raise
     
+    async def get_transcript_length(self, meeting_id: str) -> int:
+        """
+        Get meeting transcript length without transferring it.
+        
+        Args:
+            meeting_id: Unique meeting identifier
+            
+        Returns:
+            Transcript length in bytes
+        """
+        try:
+            return await self.client.strlen(f"meeting:{meeting_id}:transcript")
+        except Exception as e:
+            logger.error(f"Error getting transcript length: {e}")
+            raise
+    
+    async def get_state_and_transcript(
+        self,
+        meeting_id: str,
+        last_n_chars: Optional[int] = None
+    ) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Retrieve meeting state and transcript in a single round trip.
+        
+        Args:
+            meeting_id: Unique meeting identifier
+            last_n_chars: Optional limit to last N characters (bytes) of transcript
+            
+        Returns:
+            Tuple of (meeting state or None, transcript text)
+        """
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.hgetall(f"meeting:{meeting_id}:state")
+                _read_transcript(pipe, meeting_id, last_n_chars)
+                state_data, transcript = await pipe.execute()
+            if not state_data:
+                return None, ""
+            return _decode_state(state_data), _decode_text(transcript)
+        except Exception as e:
+            logger.error(f"Error getting meeting state and transcript: {e}")
+            raise
+    
     async def update_field(self, meeting_id: str, field: str, value: Any):
         """
         Update a specific field in meeting state.
         
+        A single atomic write, so concurrent updates of different fields
+        can't overwrite each other. Unknown meetings are left untouched.
+        
         Args:
             meeting_id: Unique meeting identifier
             field: Field name to update
             value: New value
         """
         try:
-            state = await self.get_meeting_state(meeting_id)
-            if state:
-                state[field] = value
-                await self.save_meeting_state(meeting_id, state)
+            await self._update_fields(
+                keys=[f"meeting:{meeting_id}:state"],
+                args=[field, _encode_field(value), "last_activity", _encode_field(time.time())]
+            )
         except Exception as e:
             logger.error(f"Error updating field {field}: {e}")
             raise
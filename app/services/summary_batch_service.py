@@ -0,0 +1,201 @@
+"""
+Post-meeting summaries generated through the OpenAI Batch API.
+"""
+
+from openai import NotFoundError
+from app.services.openai_service import OpenAIService
+from app.services.redis_service import RedisService
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryBatchService:
+    """
+    Service for generating final meeting summaries in OpenAI batches.
+    
+    Final summaries aren't latency sensitive, so instead of a live completion
+    they are queued, submitted periodically as one batch (at half the price of
+    the synchronous API) and written back to Redis once the batch completes.
+    """
+    
+    def __init__(
+        self,
+        openai_service: OpenAIService,
+        redis_service: RedisService,
+        flush_interval: float = 300,
+        poll_interval: float = 60
+    ):
+        """
+        Initialize summary batch service.
+        
+        Args:
+            openai_service: Service providing the OpenAI client and prompts
+            redis_service: Service used to track batches and store results
+            flush_interval: Seconds between batch submissions
+            poll_interval: Seconds between batch status checks
+        """
+        self.openai_service = openai_service
+        self.redis_service = redis_service
+        self.flush_interval = flush_interval
+        self.poll_interval = poll_interval
+        # Keyed by meeting so a meeting is never submitted twice in one
+        # batch; the Batch API rejects files with repeated custom_ids
+        self.pending: Dict[str, Tuple[str, str]] = {}
+        self._tasks: List[asyncio.Task] = []
+    
+    def enqueue(self, meeting_id: str, transcript: str, summary: str = ""):
+        """
+        Queue a final summary request for the next batch.
+        
+        Queuing the same meeting again replaces its earlier transcript.
+        
+        Args:
+            meeting_id: Unique meeting identifier
+            transcript: Most recent part of the meeting transcript
+            summary: Running summary of the meeting before the transcript
+        """
+        self.pending[meeting_id] = (transcript, summary)
+        logger.debug(f"Queued final summary for meeting {meeting_id}")
+    
+    def _build_batch_file(self, requests: Dict[str, Tuple[str, str]]) -> bytes:
+        """Encode queued summaries as Batch API JSONL input"""
+        return "\n".join(
+            json.dumps({
+                "custom_id": meeting_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self.openai_service.full_briefing_request(transcript, summary)
+            })
+            for meeting_id, (transcript, summary) in requests.items()
+        ).encode()
+    
+    async def flush(self) -> Optional[str]:
+        """
+        Submit all queued summary requests as one batch.
+        
+        Returns:
+            ID of the created batch, or None if nothing was queued
+        """
+        if not self.pending:
+            return None
+        
+        requests, self.pending = self.pending, {}
+        try:
+            client = self.openai_service.client
+            
+            # Long transcripts are encoded here; keep that off the event loop
+            data = await asyncio.to_thread(self._build_batch_file, requests)
+            
+            batch_file = await client.files.create(
+                file=("final_summaries.jsonl", data),
+                purpose="batch"
+            )
+            batch = await client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            await self.redis_service.add_summary_batch(batch.id)
+            
+            logger.info(f"Submitted summary batch {batch.id} with {len(requests)} meetings")
+            return batch.id
+        
+        except Exception as e:
+            # Put the requests back so the next flush retries them, keeping
+            # any transcript queued for the same meeting in the meantime
+            self.pending = {**requests, **self.pending}
+            logger.error(f"Error submitting summary batch: {e}")
+            raise
+    
+    async def collect(self):
+        """
+        Store results of finished batches and stop tracking them.
+        
+        Every worker runs this poller, so each batch is claimed for one poll
+        interval first; only the claiming worker retrieves it.
+        """
+        client = self.openai_service.client
+        
+        for batch_id in await self.redis_service.get_summary_batches():
+            try:
+                if not await self.redis_service.claim_summary_batch(
+                    batch_id,
+                    ttl=int(self.poll_interval)
+                ):
+                    continue
+                
+                batch = await client.batches.retrieve(batch_id)
+                
+                if batch.status in ("failed", "expired", "cancelled"):
+                    logger.error(f"Summary batch {batch_id} {batch.status}")
+                    await self.redis_service.remove_summary_batch(batch_id)
+                    continue
+                
+                if batch.status != "completed":
+                    continue
+                
+                if batch.output_file_id:
+                    output = await client.files.content(batch.output_file_id)
+                    for line in output.text.splitlines():
+                        await self._store_result(json.loads(line))
+                
+                await self.redis_service.remove_summary_batch(batch_id)
+                logger.info(f"Collected summary batch {batch_id}")
+            
+            except NotFoundError:
+                # Retrying won't bring it back; stop polling for it
+                logger.error(f"Summary batch {batch_id} not found")
+                await self.redis_service.remove_summary_batch(batch_id)
+            except Exception as e:
+                logger.error(f"Error collecting summary batch {batch_id}: {e}")
+    
+    async def _store_result(self, result: Dict):
+        """Write one batch output line back to Redis"""
+        meeting_id = result.get("custom_id")
+        response = result.get("response") or {}
+        
+        if result.get("error") or response.get("status_code") != 200:
+            logger.error(f"Final summary failed for meeting {meeting_id}: {result.get('error')}")
+            return
+        
+        try:
+            content = response["body"]["choices"][0]["message"]["content"]
+            summary = self.openai_service.parse_full_briefing(content)
+        except (KeyError, IndexError, ValueError) as e:
+            logger.error(f"Invalid final summary for meeting {meeting_id}: {e}")
+            return
+        
+        await self.redis_service.set_final_brief(meeting_id, summary)
+    
+    async def _run_periodically(self, interval: float, func):
+        """Call func every interval seconds until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await func()
+            except Exception as e:
+                logger.error(f"Summary batch task error: {e}")
+    
+    def start(self):
+        """Start background flushing and polling"""
+        self._tasks = [
+            asyncio.create_task(self._run_periodically(self.flush_interval, self.flush)),
+            asyncio.create_task(self._run_periodically(self.poll_interval, self.collect))
+        ]
+        logger.info("Summary batch service started")
+    
+    async def stop(self):
+        """Stop background tasks and submit anything still queued"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing summary batch on shutdown: {e}")
@@ -5,22 +5,86 @@ WebSocket handler for real-time audio and transcription processing.
 from fastapi import WebSocket, WebSocketDisconnect
 from app.services.deepgram_service import DeepgramService
 from app.services.redis_service import RedisService
-from app.models.schemas import MeetingStatus
+from app.services.openai_service import OpenAIService
+from app.models.schemas import MeetingStatus, WebSocketFrame
+from typing import List, Optional
+import asyncio
 import logging
-import json
+import msgspec
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Audio chunks buffered between the socket reader and the Deepgram forwarder
+AUDIO_QUEUE_SIZE = 256
+
+# Final transcript segments are written to Redis in batches of this size,
+# or at least every TRANSCRIPT_FLUSH_INTERVAL seconds
+TRANSCRIPT_FLUSH_SIZE = 8
+TRANSCRIPT_FLUSH_INTERVAL = 0.5
+
+# Enum values stored in meeting state, resolved once at import
+_STATUS_ACTIVE = MeetingStatus.ACTIVE.value
+_STATUS_ENDED = MeetingStatus.ENDED.value
+
+# Control frame decoder, built once instead of per message
+FRAME_DECODER = msgspec.json.Decoder(WebSocketFrame)
+
+# Pings are answered without decoding; fixed replies are encoded up front
+PING_FRAMES = frozenset({'{"type":"ping"}', '{"type": "ping"}'})
+PONG_FRAME = orjson.dumps({"type": "pong", "data": {}}).decode()
+ACK_FRAME = orjson.dumps({"type": "ack", "data": {"message": "Meeting started"}}).decode()
+
+# Interim results that only extend the previously sent one by fewer
+# characters than this are not forwarded to the client
+MIN_INTERIM_GROWTH = 4
+
+# Final segments folded into the running meeting summary per update
+SUMMARY_UPDATE_SEGMENTS = 40
+
 # Service instances (will be initialized in main.py)
 deepgram_service: DeepgramService = None
 redis_service: RedisService = None
+openai_service: OpenAIService = None
 
 
-def init_services(deepgram: DeepgramService, redis: RedisService):
+def init_services(deepgram: DeepgramService, redis: RedisService, openai: OpenAIService):
     """Initialize service instances"""
-    global deepgram_service, redis_service
+    global deepgram_service, redis_service, openai_service
     deepgram_service = deepgram
     redis_service = redis
+    openai_service = openai
+
+
+async def _forward_audio(audio_queue: asyncio.Queue):
+    """Send queued audio chunks to Deepgram until a None sentinel arrives"""
+    while True:
+        chunk = await audio_queue.get()
+        if chunk is None:
+            return
+        await deepgram_service.send_audio(chunk)
+
+
+async def _update_summary(meeting_id: str, segments: List[str]):
+    """Fold new final segments into the meeting's running summary"""
+    try:
+        summary = await redis_service.get_summary(meeting_id)
+        summary = await openai_service.update_summary(summary, "\n".join(segments))
+        await redis_service.set_summary(meeting_id, summary)
+    except Exception as e:
+        logger.error(f"Error updating summary for meeting {meeting_id}: {e}")
+
+
+async def _send_frame(websocket: WebSocket, frame: dict):
+    """Send a JSON text frame, encoded with orjson"""
+    await websocket.send_text(orjson.dumps(frame).decode())
+
+
+def _enqueue_audio(audio_queue: asyncio.Queue, chunk: Optional[bytes]):
+    """Queue an audio chunk, dropping the oldest one if the forwarder fell behind"""
+    if audio_queue.full():
+        audio_queue.get_nowait()
+    audio_queue.put_nowait(chunk)
 
 
 async def handle_websocket(websocket: WebSocket, user_id: str):
@@ -39,27 +103,77 @@ async def handle_websocket(websocket: WebSocket, user_id: str):
     # For now, we'll track the meeting_id from the first message
     meeting_id = None
     deepgram_connection = None
+    audio_queue: asyncio.Queue = asyncio.Queue(maxsize=AUDIO_QUEUE_SIZE)
+    audio_forwarder: Optional[asyncio.Task] = None
+    pending_finals: List[str] = []
+    flush_lock = asyncio.Lock()
+    flusher_stopped = asyncio.Event()
+    transcript_flusher: Optional[asyncio.Task] = None
+    unsummarized: List[str] = []
+    summary_task: Optional[asyncio.Task] = None
+    last_interim = ""
+    
+    async def flush_finals():
+        """Write buffered final segments to Redis in one command"""
+        # Serialized so batches land in the order they were spoken
+        async with flush_lock:
+            if not pending_finals:
+                return
+            batch = pending_finals.copy()
+            pending_finals.clear()
+            try:
+                await redis_service.append_transcript_batch(meeting_id, batch)
+            except Exception:
+                # Keep the segments for the next flush
+                pending_finals[:0] = batch
+                raise
+    
+    async def flush_finals_periodically():
+        """Flush trailing segments during quiet stretches and once more on stop"""
+        while not flusher_stopped.is_set():
+            try:
+                await asyncio.wait_for(flusher_stopped.wait(), TRANSCRIPT_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await flush_finals()
+            except Exception as e:
+                logger.error(f"Error flushing transcript: {e}")
     
     try:
         # Set up transcript callback
         async def on_transcript(self, result, **kwargs):
             try:
-                nonlocal meeting_id
+                nonlocal meeting_id, summary_task, last_interim
                 
                 sentence = result.channel.alternatives[0].transcript
                 
-                if len(sentence) == 0:
+                if not sentence.strip():
                     return
                 
                 if result.is_final:
                     logger.info(f"Transcript: {sentence}")
+                    last_interim = ""
                     
-                    # Append to Redis transcript
+                    # Buffer for the next batched Redis append
                     if meeting_id:
-                        await redis_service.append_transcript(meeting_id, sentence)
+                        pending_finals.append(sentence)
+                        if len(pending_finals) >= TRANSCRIPT_FLUSH_SIZE:
+                            await flush_finals()
+                        
+                        # Keep the running summary current, one update at a time
+                        unsummarized.append(sentence)
+                        if (
+                            len(unsummarized) >= SUMMARY_UPDATE_SEGMENTS
+                            and (summary_task is None or summary_task.done())
+                        ):
+                            summary_task = asyncio.create_task(
+                                _update_summary(meeting_id, unsummarized.copy())
+                            )
+                            unsummarized.clear()
                         
                         # Send transcript update to client
-                        await websocket.send_json({
+                        await _send_frame(websocket, {
                             "type": "transcript_update",
                             "data": {
                                 "text": sentence,
@@ -68,8 +182,16 @@ async def handle_websocket(websocket: WebSocket, user_id: str):
                             }
                         })
                 else:
+                    # Skip interims that only add a token or two to the last one
+                    if (
+                        sentence.startswith(last_interim)
+                        and len(sentence) - len(last_interim) < MIN_INTERIM_GROWTH
+                    ):
+                        return
+                    last_interim = sentence
+                    
                     # Send interim results
-                    await websocket.send_json({
+                    await _send_frame(websocket, {
                         "type": "transcript_update",
                         "data": {
                             "text": sentence,
@@ -86,6 +208,11 @@ async def handle_websocket(websocket: WebSocket, user_id: str):
             on_transcript=on_transcript
         )
         
+        # Forward audio from a separate task so reading the socket never
+        # waits on Deepgram
+        audio_forwarder = asyncio.create_task(_forward_audio(audio_queue))
+        transcript_flusher = asyncio.create_task(flush_finals_periodically())
+        
         # Main message loop
         while True:
             # Receive data from client
@@ -93,43 +220,37 @@ async def handle_websocket(websocket: WebSocket, user_id: str):
             
             if "text" in data:
                 # Handle text messages (control messages)
+                if data["text"] in PING_FRAMES:
+                    await websocket.send_text(PONG_FRAME)
+                    continue
+                
                 try:
-                    message = json.loads(data["text"])
-                    message_type = message.get("type")
+                    message = FRAME_DECODER.decode(data["text"])
+                    message_type = message.type
                     
                     if message_type == "meeting_started":
                         # Client notifies us of the meeting ID
-                        meeting_id = message.get("meeting_id")
+                        meeting_id = message.meeting_id
                         logger.info(f"WebSocket associated with meeting {meeting_id}")
                         
                         # Update meeting status to active
-                        await redis_service.update_field(
-                            meeting_id,
-                            "status",
-                            MeetingStatus.ACTIVE.value
-                        )
+                        await redis_service.update_field(meeting_id, "status", _STATUS_ACTIVE)
                         
-                        await websocket.send_json({
-                            "type": "ack",
-                            "data": {"message": "Meeting started"}
-                        })
+                        await websocket.send_text(ACK_FRAME)
                     
                     elif message_type == "ping":
-                        await websocket.send_json({
-                            "type": "pong",
-                            "data": {}
-                        })
+                        await websocket.send_text(PONG_FRAME)
                         
-                except json.JSONDecodeError:
-                    logger.warning(f"Invalid JSON received: {data['text']}")
+                except msgspec.DecodeError:
+                    logger.warning(f"Invalid message received: {data['text']}")
             
             elif "bytes" in data:
                 # Handle binary audio data
                 audio_bytes = data["bytes"]
                 
-                # Forward audio to Deepgram
+                # Queue audio for forwarding to Deepgram
                 if deepgram_connection:
-                    await deepgram_service.send_audio(audio_bytes)
+                    _enqueue_audio(audio_queue, audio_bytes)
     
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for user {user_id}")
@@ -139,17 +260,36 @@ async def handle_websocket(websocket: WebSocket, user_id: str):
     
     finally:
         # Clean up
+        if audio_forwarder:
+            # Let already queued audio reach Deepgram before closing it
+            _enqueue_audio(audio_queue, None)
+            try:
+                await audio_forwarder
+            except Exception as e:
+                logger.error(f"Error forwarding audio to Deepgram: {e}")
+        
         if deepgram_connection:
             await deepgram_service.stop_transcription()
         
+        # Persist any transcript segments still buffered; the flusher does a
+        # last flush when stopped rather than being cancelled mid-write
+        if transcript_flusher:
+            flusher_stopped.set()
+            await transcript_flusher
+        
+        # Fold segments not yet summarized into the running summary, after
+        # any update still in flight so the two don't overwrite each other;
+        # a reconnecting session starts with none of them
+        if summary_task:
+            await summary_task
+        if unsummarized:
+            await _update_summary(meeting_id, unsummarized.copy())
+            unsummarized.clear()
+        
         # Update meeting status
         if meeting_id:
             try:
-                await redis_service.update_field(
-                    meeting_id,
-                    "status",
-                    MeetingStatus.ENDED.value
-                )
+                await redis_service.update_field(meeting_id, "status", _STATUS_ENDED)
             except Exception as e:
                 logger.error(f"Error updating meeting status on disconnect: {e}")
         
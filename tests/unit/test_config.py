@@ -4,7 +4,16 @@ Unit tests for configuration module.
 
 import pytest
 import os
-from app.config import Settings
+from pydantic import ValidationError
+from app.config import Settings, get_settings
+
+
+@pytest.fixture
+def fresh_settings():
+    """Clear the cached settings before and after the test"""
+    get_settings.cache_clear()
+    yield get_settings
+    get_settings.cache_clear()
 
 
 def test_settings_from_env(monkeypatch):
@@ -33,9 +42,12 @@ def test_settings_defaults(monkeypatch):
     
     assert settings.redis_host == "localhost"
     assert settings.redis_port == 6379
+    assert settings.redis_max_connections == 32
     assert settings.app_host == "0.0.0.0"
     assert settings.app_port == 8000
     assert settings.app_env == "development"
+    assert settings.openai_max_concurrency == 16
+    assert settings.summary_batch_interval == 300
 
 
 def test_redis_url_without_password(monkeypatch):
@@ -78,6 +90,7 @@ def test_cors_origins_list(monkeypatch):
     settings = Settings()
     
     assert settings.cors_origins_list == ["http://localhost:3000", "http://localhost:8000"]
+    assert settings.cors_origins_list is settings.cors_origins_list
 
 
 def test_is_production(monkeypatch):
@@ -104,3 +117,18 @@ def test_is_not_production(monkeypatch):
     settings = Settings()
     
     assert settings.is_production is False
+
+
+def test_get_settings_cached(monkeypatch, fresh_settings):
+    """Test get_settings returns one shared, read-only instance"""
+    monkeypatch.setenv("RECALL_API_KEY", "test_recall_key")
+    monkeypatch.setenv("DEEPGRAM_API_KEY", "test_deepgram_key")
+    monkeypatch.setenv("OPENAI_API_KEY", "test_openai_key")
+    monkeypatch.setenv("WEBSOCKET_DOMAIN", "test.example.com")
+    
+    settings = fresh_settings()
+    
+    assert fresh_settings() is settings
+    assert settings.redis_url == "redis://localhost:6379"
+    with pytest.raises(ValidationError):
+        settings.app_env = "production"
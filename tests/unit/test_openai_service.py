@@ -0,0 +1,194 @@
+"""
+Unit tests for the OpenAI service.
+"""
+
+import json
+import pytest
+import httpx
+from openai import AsyncOpenAI, RateLimitError
+from app.services import openai_service
+from app.services.openai_service import OpenAIService, briefing_prompt, prepare_transcript
+
+
+def stream_body(*deltas):
+    """Build a server-sent event stream of chat completion chunks"""
+    events = [
+        "data: " + json.dumps({
+            "id": "chatcmpl_1",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}]
+        })
+        for delta in deltas
+    ]
+    return "\n\n".join(events + ["data: [DONE]"]) + "\n\n"
+
+
+def streaming_service(*deltas):
+    """
+    OpenAIService backed by a fake API that streams deltas for every completion.
+    
+    Also returns the list of completion requests the fake API received.
+    """
+    received = []
+    
+    def respond(request):
+        received.append(request)
+        return httpx.Response(
+            200,
+            text=stream_body(*deltas),
+            headers={"content-type": "text/event-stream"}
+        )
+    
+    service = OpenAIService("test_key")
+    service.client = AsyncOpenAI(
+        api_key="test_key",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(respond))
+    )
+    service._completions_client = service.client.with_options(max_retries=0)
+    return service, received
+
+
+def service_answering(*responses):
+    """
+    OpenAIService whose completion requests get the given responses in turn.
+    
+    Also returns the list of completion requests it received.
+    """
+    received = []
+    
+    def next_response(request):
+        received.append(request)
+        return responses[len(received) - 1]
+    
+    service = OpenAIService("test_key")
+    service._completions_client = AsyncOpenAI(
+        api_key="test_key",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(next_response))
+    )
+    return service, received
+
+
+def rate_limited(code="rate_limit_exceeded", retry_after=None):
+    """A 429 response from the completions API"""
+    headers = {"retry-after": retry_after} if retry_after else {}
+    return httpx.Response(429, headers=headers, json={"error": {"message": "Slow down", "code": code}})
+
+
+def completion(content):
+    """A successful chat completion response"""
+    return httpx.Response(200, json={
+        "id": "chatcmpl_1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4o-mini",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }]
+    })
+
+async def test_stream_response_yields_sentences():
+    """Test streamed deltas are regrouped into complete sentences"""
+    service, _ = streaming_service("Budget was appr", "oved. Next step", "s are due Friday! Any", " questions")
+    
+    sentences = [s async for s in service.stream_response("What happened?", "context")]
+    
+    assert sentences == ["Budget was approved.", "Next steps are due Friday!", "Any questions"]
+
+
+async def test_stream_response_replays_cached_answer():
+    """Test the same question over the same context is answered from cache"""
+    service, received = streaming_service("Yes. ", "It was.")
+    
+    first = [s async for s in service.stream_response("Was it approved?", "context")]
+    second = [s async for s in service.stream_response("Was it approved?", "context")]
+    
+    assert first == second == ["Yes.", "It was."]
+    assert len(received) == 1
+
+
+async def test_rate_limit_retry_waits_for_retry_after(monkeypatch):
+    """Test a 429 with Retry-After is retried after the server's delay"""
+    delays = []
+    
+    async def record_sleep(delay):
+        delays.append(delay)
+    
+    monkeypatch.setattr(openai_service.asyncio, "sleep", record_sleep)
+    service, received = service_answering(rate_limited(retry_after="2"), completion("Done"))
+    
+    response = await service._create_completion(model="gpt-4o-mini", messages=[])
+    
+    assert response.choices[0].message.content == "Done"
+    assert delays == [2.0]
+    assert len(received) == 2
+
+
+async def test_insufficient_quota_not_retried():
+    """Test a 429 for an exhausted quota is raised without retrying"""
+    service, received = service_answering(rate_limited(code="insufficient_quota"), completion("Done"))
+    
+    with pytest.raises(RateLimitError):
+        await service._create_completion(model="gpt-4o-mini", messages=[])
+    assert len(received) == 1
+
+
+def test_parse_full_briefing():
+    """Test a schema-conforming briefing is parsed and key points capped at 5"""
+    content = json.dumps({
+        "brief": "Budget approved",
+        "key_points": ["a", "b", "c", "d", "e", "f"],
+        "speakers": ["Alice", " ", "Bob"]
+    })
+    
+    briefing = OpenAIService("test_key").parse_full_briefing(content)
+    
+    assert briefing == {
+        "brief": "Budget approved",
+        "key_points": ["a", "b", "c", "d", "e"],
+        "speakers": ["Alice", "Bob"]
+    }
+
+
+@pytest.mark.parametrize("content", [
+    "not json",
+    json.dumps({"brief": "Missing fields"}),
+    json.dumps(["not", "an", "object"])
+])
+def test_parse_full_briefing_invalid(content):
+    """Test malformed briefings raise ValueError"""
+    with pytest.raises(ValueError):
+        OpenAIService("test_key").parse_full_briefing(content)
+
+
+def test_prepare_transcript_collapses_whitespace():
+    """Test blank lines and runs of spaces are collapsed"""
+    transcript = "  Alice: hi   there\n\n\n\nBob:\tok  \n"
+    
+    assert prepare_transcript(transcript) == "Alice: hi there\nBob:\tok"
+
+
+def test_prepare_transcript_keeps_most_recent(monkeypatch):
+    """Test long transcripts are cut down to their most recent part"""
+    monkeypatch.setattr(openai_service, "MAX_TRANSCRIPT_CHARS", 10)
+    
+    assert prepare_transcript("old words new words") == "new words"
+
+
+def test_briefing_prompt_with_summary():
+    """Test the running summary precedes the recent transcript window"""
+    prompt = briefing_prompt("Bob: ship it", "Budget approved earlier")
+    
+    assert prompt.index("Budget approved earlier") < prompt.index("Bob: ship it")
+    assert prompt.startswith("Summary of the meeting so far:")
+
+
+def test_briefing_prompt_without_summary():
+    """Test meetings without a summary yet get the plain transcript prompt"""
+    assert briefing_prompt("Bob: ship it") == (
+        "Transcript:\nBob: ship it\n\nGenerate a brief meeting summary."
+    )
@@ -0,0 +1,102 @@
+"""
+Unit tests for the Recall.ai service retry policy.
+"""
+
+import pytest
+import httpx
+from app.services import recall_service
+from app.services.recall_service import RecallService
+
+
+def recall_with_outcomes(monkeypatch, outcomes):
+    """
+    RecallService talking to a fake API that answers with outcomes in turn.
+    
+    An outcome is either a response status code or a transport exception to
+    raise. Backoff is disabled so retries run immediately. Also returns the
+    requests the fake API received, one per attempt.
+    """
+    monkeypatch.setattr(recall_service, "BACKOFF_BASE", 0)
+    attempts = []
+    
+    def answer(request):
+        outcome = outcomes[len(attempts)]
+        attempts.append(request)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome, json={"id": "bot_1"})
+    
+    service = RecallService("test_key")
+    service.client = httpx.AsyncClient(
+        base_url=service.base_url,
+        transport=httpx.MockTransport(answer)
+    )
+    return service, attempts
+
+
+async def test_get_retried_on_server_error(monkeypatch):
+    """Test GET is retried on 503 until it succeeds"""
+    service, attempts = recall_with_outcomes(monkeypatch, [503, 503, 200])
+    
+    assert await service.get_bot("bot_1") == {"id": "bot_1"}
+    assert len(attempts) == 3
+
+
+async def test_get_gives_up_after_max_attempts(monkeypatch):
+    """Test GET raises once all attempts fail"""
+    service, attempts = recall_with_outcomes(monkeypatch, [503, 503, 503])
+    
+    with pytest.raises(httpx.HTTPStatusError):
+        await service.get_bot("bot_1")
+    assert len(attempts) == recall_service.MAX_ATTEMPTS
+
+
+async def test_get_client_error_not_retried(monkeypatch):
+    """Test GET is not retried on 404"""
+    service, attempts = recall_with_outcomes(monkeypatch, [404])
+    
+    with pytest.raises(httpx.HTTPStatusError):
+        await service.get_bot("bot_1")
+    assert len(attempts) == 1
+
+
+async def test_post_server_error_not_retried(monkeypatch):
+    """Test POST is not retried on 500, since it may have been processed"""
+    service, attempts = recall_with_outcomes(monkeypatch, [500, 200])
+    
+    with pytest.raises(httpx.HTTPStatusError):
+        await service.send_speech("bot_1", "Hello")
+    assert len(attempts) == 1
+
+
+async def test_post_retried_on_rate_limit(monkeypatch):
+    """Test POST is retried on 429"""
+    service, attempts = recall_with_outcomes(monkeypatch, [429, 200])
+    
+    assert await service.send_speech("bot_1", "Hello") == {"id": "bot_1"}
+    assert len(attempts) == 2
+
+
+async def test_post_retried_on_connect_error(monkeypatch):
+    """Test POST is retried when the connection couldn't be established"""
+    service, attempts = recall_with_outcomes(monkeypatch, [httpx.ConnectError("refused"), 200])
+    
+    assert await service.leave_meeting("bot_1") == {"id": "bot_1"}
+    assert len(attempts) == 2
+
+
+async def test_post_read_timeout_raises(monkeypatch):
+    """Test POST is not retried after a read timeout"""
+    service, attempts = recall_with_outcomes(monkeypatch, [httpx.ReadTimeout("slow"), 200])
+    
+    with pytest.raises(httpx.ReadTimeout):
+        await service.create_bot("https://zoom.us/j/1", "wss://example.com/ws/u1")
+    assert len(attempts) == 1
+
+
+async def test_get_retried_on_read_timeout(monkeypatch):
+    """Test GET is retried after a read timeout"""
+    service, attempts = recall_with_outcomes(monkeypatch, [httpx.ReadTimeout("slow"), 200])
+    
+    assert await service.get_bot("bot_1") == {"id": "bot_1"}
+    assert len(attempts) == 2
@@ -0,0 +1,72 @@
+"""
+Unit tests for Redis state encoding helpers.
+"""
+
+import pytest
+from app.services.redis_service import (
+    _decode_state,
+    _decode_text,
+    _encode_field,
+    _read_transcript
+)
+
+
+class RecordingClient:
+    """Stand-in client that records the commands issued on it"""
+    
+    def __init__(self):
+        self.commands = []
+    
+    def get(self, *args):
+        self.commands.append(("get", *args))
+    
+    def getrange(self, *args):
+        self.commands.append(("getrange", *args))
+
+
+def test_state_round_trip():
+    """Test state fields survive encoding into and decoding from a hash"""
+    state = {
+        "meeting_id": "bot_1",
+        "user_id": "12345",
+        "speakers": ["Alice", "Bob"],
+        "started_at_ts": 1700000000.5,
+        "metadata": {"source": "zoom"}
+    }
+    
+    stored = {field.encode(): _encode_field(value) for field, value in state.items()}
+    
+    assert _decode_state(stored) == state
+
+
+def test_numeric_string_field_stays_string():
+    """Test string values that look like JSON aren't decoded as numbers"""
+    stored = {b"user_id": _encode_field("12345")}
+    
+    assert _decode_state(stored) == {"user_id": "12345"}
+
+
+def test_decode_missing_state():
+    """Test an empty hash means the meeting doesn't exist"""
+    assert _decode_state({}) is None
+
+
+def test_decode_text_drops_partial_characters():
+    """Test a tail starting mid-character decodes without the partial bytes"""
+    data = "é and more\n".encode()[1:]
+    
+    assert _decode_text(data) == "and more"
+    assert _decode_text(None) == ""
+
+
+@pytest.mark.parametrize("last_n_chars,expected", [
+    (None, ("get", "meeting:bot_1:transcript")),
+    (2000, ("getrange", "meeting:bot_1:transcript", -2000, -1))
+])
+def test_read_transcript(last_n_chars, expected):
+    """Test transcript reads use a negative GETRANGE only for tails"""
+    client = RecordingClient()
+    
+    _read_transcript(client, "bot_1", last_n_chars)
+    
+    assert client.commands == [expected]
@@ -3,6 +3,7 @@ Unit tests for data models and schemas.
 """
 
 import pytest
+import msgspec
 from datetime import datetime
 from app.models.schemas import (
     JoinMeetingRequest,
@@ -11,7 +12,8 @@ from app.models.schemas import (
     BriefingResponse,
     MeetingStatus,
     MeetingPlatform,
-    TranscriptSegment
+    TranscriptSegment,
+    WebSocketFrame
 )
 
 
@@ -38,6 +40,33 @@ def test_join_meeting_request_default_bot_name():
     assert request.bot_name == "AI Meeting Assistant"
 
 
+def test_join_meeting_request_platform():
+    """Test platform detection from meeting URL host"""
+    urls = {
+        "https://zoom.us/j/123456789": MeetingPlatform.ZOOM,
+        "https://us02web.zoom.us/j/123456789": MeetingPlatform.ZOOM,
+        "https://teams.microsoft.com/l/meetup-join/abc": MeetingPlatform.TEAMS,
+        "https://teams.live.com/meet/123": MeetingPlatform.TEAMS,
+        "https://meet.google.com/abc-defg-hij": MeetingPlatform.MEET,
+        "https://example.com/zoom.us": MeetingPlatform.UNKNOWN,
+    }
+    
+    for url, platform in urls.items():
+        request = JoinMeetingRequest(meeting_url=url, user_id="test_user")
+        assert request.platform == platform
+
+
+def test_join_meeting_request_platform_host_case():
+    """Test platform detection relies on the normalized host, not the raw URL"""
+    request = JoinMeetingRequest(
+        meeting_url="https://US02WEB.Zoom.US/j/123456789",
+        user_id="test_user"
+    )
+    
+    assert request.meeting_url.host == "us02web.zoom.us"
+    assert request.platform == MeetingPlatform.ZOOM
+
+
 def test_ask_question_request():
     """Test AskQuestionRequest model validation"""
     request = AskQuestionRequest(
@@ -128,3 +157,21 @@ def test_meeting_platform_enum():
     assert MeetingPlatform.TEAMS.value == "microsoft_teams"
     assert MeetingPlatform.MEET.value == "google_meet"
     assert MeetingPlatform.UNKNOWN.value == "unknown"
+
+
+def test_websocket_frame_decoding():
+    """Test WebSocket control messages decode into WebSocketFrame"""
+    frame = msgspec.json.decode(
+        '{"type": "meeting_started", "meeting_id": "bot_123"}',
+        type=WebSocketFrame
+    )
+    
+    assert frame.type == "meeting_started"
+    assert frame.meeting_id == "bot_123"
+    assert frame.data == {}
+
+
+def test_websocket_frame_requires_type():
+    """Test WebSocket control messages without a type are rejected"""
+    with pytest.raises(msgspec.DecodeError):
+        msgspec.json.decode('{"data": {}}', type=WebSocketFrame)
@@ -0,0 +1,141 @@
+"""
+Unit tests for the summary batch service.
+"""
+
+import json
+import pytest
+import httpx
+from types import SimpleNamespace
+from openai import NotFoundError
+from app.services.openai_service import OpenAIService
+from app.services.summary_batch_service import SummaryBatchService
+
+
+class FakeRedisService:
+    """Stand-in for RedisService that keeps batches and final briefs in memory"""
+    
+    def __init__(self):
+        self.final_briefs = {}
+        self.batches = set()
+        self.claimed = set()
+    
+    async def set_final_brief(self, meeting_id, summary):
+        self.final_briefs[meeting_id] = summary
+    
+    async def get_summary_batches(self):
+        return set(self.batches)
+    
+    async def claim_summary_batch(self, batch_id, ttl):
+        if batch_id in self.claimed:
+            return False
+        self.claimed.add(batch_id)
+        return True
+    
+    async def remove_summary_batch(self, batch_id):
+        self.batches.discard(batch_id)
+
+
+@pytest.fixture
+def batch_service():
+    """Summary batch service backed by an in-memory Redis stand-in"""
+    return SummaryBatchService(OpenAIService("test_key"), FakeRedisService())
+
+
+def batch_result(meeting_id, content, status_code=200):
+    """Build one Batch API output line"""
+    return {
+        "custom_id": meeting_id,
+        "response": {
+            "status_code": status_code,
+            "body": {"choices": [{"message": {"content": content}}]}
+        },
+        "error": None
+    }
+
+
+def test_enqueue_replaces_same_meeting(batch_service):
+    """Test a meeting queued twice is submitted once, with its latest transcript"""
+    batch_service.enqueue("bot_1", "first")
+    batch_service.enqueue("bot_2", "other")
+    batch_service.enqueue("bot_1", "second")
+    
+    lines = batch_service._build_batch_file(batch_service.pending).decode().splitlines()
+    requests = [json.loads(line) for line in lines]
+    
+    assert [r["custom_id"] for r in requests] == ["bot_1", "bot_2"]
+    assert "second" in requests[0]["body"]["messages"][1]["content"]
+
+
+def test_batch_request_includes_running_summary(batch_service):
+    """Test the final summary prompt carries the running summary before the transcript"""
+    batch_service.enqueue("bot_1", "Bob: ship it", "Budget approved earlier")
+    
+    request = json.loads(batch_service._build_batch_file(batch_service.pending))
+    prompt = request["body"]["messages"][1]["content"]
+    
+    assert prompt.index("Budget approved earlier") < prompt.index("Bob: ship it")
+
+
+async def test_store_result(batch_service):
+    """Test a successful output line is stored as the final brief"""
+    content = json.dumps({"brief": "Summary", "key_points": ["A"], "speakers": ["Alice"]})
+    
+    await batch_service._store_result(batch_result("bot_1", content))
+    
+    assert batch_service.redis_service.final_briefs["bot_1"] == {
+        "brief": "Summary",
+        "key_points": ["A"],
+        "speakers": ["Alice"]
+    }
+
+
+async def test_store_result_skips_failed_request(batch_service):
+    """Test failed requests in a batch don't store anything"""
+    await batch_service._store_result(batch_result("bot_1", "", status_code=500))
+    
+    assert batch_service.redis_service.final_briefs == {}
+
+
+async def test_store_result_skips_invalid_content(batch_service):
+    """Test content that doesn't match the briefing schema is skipped"""
+    await batch_service._store_result(batch_result("bot_1", "not json"))
+    
+    assert batch_service.redis_service.final_briefs == {}
+
+
+def with_batch_lookup(batch_service, retrieve):
+    """Point the batch service at a fake OpenAI client whose batch lookup is retrieve"""
+    batch_service.openai_service.client = SimpleNamespace(
+        batches=SimpleNamespace(retrieve=retrieve)
+    )
+
+
+async def test_collect_skips_batches_claimed_elsewhere(batch_service):
+    """Test a batch claimed by another worker isn't retrieved again"""
+    retrieved = []
+    
+    async def retrieve(batch_id):
+        retrieved.append(batch_id)
+        return SimpleNamespace(status="in_progress")
+    
+    with_batch_lookup(batch_service, retrieve)
+    batch_service.redis_service.batches = {"batch_1"}
+    
+    await batch_service.collect()
+    await batch_service.collect()
+    
+    assert retrieved == ["batch_1"]
+
+
+async def test_collect_drops_missing_batch(batch_service):
+    """Test a batch OpenAI no longer knows about stops being tracked"""
+    async def retrieve(batch_id):
+        request = httpx.Request("GET", f"https://api.openai.com/v1/batches/{batch_id}")
+        raise NotFoundError("No such batch", response=httpx.Response(404, request=request), body=None)
+    
+    with_batch_lookup(batch_service, retrieve)
+    batch_service.redis_service.batches = {"batch_1"}
+    
+    await batch_service.collect()
+    
+    assert batch_service.redis_service.batches == set()